@@ -1,11 +1,32 @@
 import os
 import sys
+import logging
+import logging.handlers
 from .client import JulesPlanner
 from .github import get_issue_context, post_comment_to_github
 
+log = logging.getLogger("jules_planner")
+
+def _configure_logging() -> None:
+    """Send package logs to stdout, buffered and written out in batches."""
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    # Flushed when full, on any error, and at interpreter exit
+    buffer_handler = logging.handlers.MemoryHandler(
+        capacity=32,
+        flushLevel=logging.ERROR,
+        target=stream_handler
+    )
+
+    log.addHandler(buffer_handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
 def main():
     """Main execution function."""
-    print("🚀 Jules Planning Integration Started")
+    _configure_logging()
+    log.info("🚀 Jules Planning Integration Started")
 
     # Get API key
     api_key = os.getenv("JULES_API_KEY")
@@ -23,7 +44,7 @@ To enable Jules planning:
 
 For more information, see the [Jules API documentation](https://developers.google.com/jules/api).
 """
-        print(error_msg)
+        log.error(error_msg)
         try:
             post_comment_to_github(error_msg)
         except Exception:
@@ -34,7 +55,7 @@ For more information, see the [Jules API documentation](https://developers.googl
     repo = os.getenv("GITHUB_REPOSITORY")
     if not repo or "/" not in repo:
         error_msg = "❌ Error: Could not determine repository owner and name"
-        print(error_msg)
+        log.error(error_msg)
         try:
             post_comment_to_github(error_msg)
         except Exception:
@@ -45,13 +66,13 @@ For more information, see the [Jules API documentation](https://developers.googl
 
     try:
         # Get issue/PR context
-        print("📋 Extracting issue context...")
+        log.info("📋 Extracting issue context...")
         context = get_issue_context()
-        print(f"   Issue #{context['number']}: {context['title']}")
-        print(f"   Requested by: @{context['author']}")
+        log.info(f"   Issue #{context['number']}: {context['title']}")
+        log.info(f"   Requested by: @{context['author']}")
 
         # Generate plan
-        print("🤔 Generating architecture plan with Jules...")
+        log.info("🤔 Generating architecture plan with Jules...")
         planner = JulesPlanner(api_key, repo_owner, repo_name)
         plan = planner.generate_plan(context)
 
@@ -70,10 +91,10 @@ For more information, see the [Jules API documentation](https://developers.googl
 """
 
         # Post to GitHub
-        print("📤 Posting plan to GitHub...")
-        post_comment_to_github(formatted_response)
+        log.info("📤 Posting plan to GitHub...")
+        post_comment_to_github(formatted_response, context["number"])
 
-        print("✅ Jules planning completed successfully")
+        log.info("✅ Jules planning completed successfully")
 
     except Exception as e:
         error_msg = f"""❌ **Jules Planning Error**
@@ -86,7 +107,7 @@ An error occurred while generating the plan:
 
 Please check the workflow logs for more details.
 """
-        print(f"Error: {str(e)}")
+        log.error(f"Error: {str(e)}")
         post_comment_to_github(error_msg)
         sys.exit(1)
 
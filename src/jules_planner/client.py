@@ -1,6 +1,102 @@
+import logging
+import random
 import time
-import requests
-from typing import Dict, Any, Optional, List
+import orjson
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Tuple, Iterator
+
+# requests (with urllib3, idna, charset_normalizer, certifi) dominates import
+# time, so it is only imported once the first API call is made.
+if TYPE_CHECKING:
+    import requests
+
+log = logging.getLogger(__name__)
+
+# Activity polling backs off exponentially from the base interval up to the
+# cap while a session shows no progress.
+POLL_BASE_INTERVAL = 1.5
+POLL_BACKOFF_FACTOR = 1.6
+POLL_MAX_INTERVAL = 15.0
+
+# Upper bound on sessions created concurrently by generate_plans; matches
+# the Jules connection pool size.
+MAX_PARALLEL_SESSIONS = 10
+
+# Server-side filter for the activity types plan polling acts on; progress
+# updates are kept so the poll backoff can reset while a session is working.
+PLAN_ACTIVITY_FILTER = 'type="planGenerated" OR type="progressUpdated" OR type="sessionCompleted"'
+
+# Dynamic part of the planning prompt, filled with the issue/PR details
+_PROMPT_HEADER_TMPL = """Create a detailed architecture and implementation plan for the following request.
+
+**{entity_type} #{number}: {title}**
+
+**Description:**
+{body}
+
+**Planning Request:**
+{comment}
+"""
+
+# Static instructions appended unchanged to every planning prompt
+_PROMPT_TAIL = """Please provide a comprehensive architecture and design plan that includes:
+
+1. **Architecture Overview**
+   - High-level system design
+   - Key components and their interactions
+   - Data flow diagrams (in text/markdown format)
+
+2. **Technology Stack Recommendations**
+   - Recommended technologies and frameworks
+   - Justification for each choice
+   - Alternatives considered
+
+3. **Implementation Strategy**
+   - Phased implementation approach
+   - Key milestones and deliverables
+   - Dependencies and prerequisites
+
+4. **Design Decisions**
+   - Critical architectural decisions
+   - Trade-offs and rationale
+   - Scalability considerations
+
+5. **Security & Performance**
+   - Security considerations
+   - Performance optimization strategies
+   - Monitoring and observability approach
+
+6. **Risk Analysis**
+   - Potential risks and challenges
+   - Mitigation strategies
+   - Fallback options
+
+7. **Next Steps**
+   - Immediate action items
+   - Long-term roadmap
+   - Success criteria
+
+Format your response in clear, well-structured Markdown. Use diagrams (ASCII/text-based), tables, and code examples where appropriate.
+
+Focus on practical, actionable recommendations that can guide the development team.
+"""
+
+# Activity payload keys the planner acts on; each activity carries one
+_ACTIVITY_KINDS = frozenset({"planGenerated", "progressUpdated", "sessionCompleted"})
+
+
+def _activity_kind(activity: Dict[str, Any]) -> Optional[str]:
+    """Return which of the handled activity types this activity is, if any."""
+    return next(iter(activity.keys() & _ACTIVITY_KINDS), None)
+
+
+def _timestamp_key(timestamp: str) -> str:
+    """
+    Pad an RFC 3339 "Z" timestamp to nine fractional digits so timestamps
+    compare correctly as strings whatever precision the API sent.
+    """
+    seconds, _, fraction = timestamp.rstrip("Z").partition(".")
+    return f"{seconds}.{fraction:0<9}Z"
+
 
 class JulesPlanner:
     """Client for Jules API planning requests."""
@@ -15,38 +111,101 @@ class JulesPlanner:
         self.repo_name = repo_name
         # Official Jules API base URL
         self.base_url = "https://jules.googleapis.com/v1alpha"
+        # Only the API key goes on every request; Content-Type is sent with
+        # request bodies alone so GET polls carry no unused headers.
         self.headers = {
-            "X-Goog-Api-Key": api_key,
-            "Content-Type": "application/json"
+            "X-Goog-Api-Key": api_key
         }
 
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        # Created on first use by the _session property
+        self._http_session: Optional["requests.Session"] = None
+        # Retry-free session for the streaming watch, created on first use
+        self._http_watch_session: Optional["requests.Session"] = None
+        # (owner, repo) -> source name, filled from list_sources on first lookup
+        self._source_cache: Dict[Tuple[str, str], str] = {}
+        # session ID -> createTime of the newest activity already polled
+        self._last_activity_seen: Dict[str, str] = {}
+        # Cleared if the API rejects the activity filter with a 400
+        self._activity_filter_supported = True
+        # None until the streaming activities endpoint has been tried once
+        self._watch_supported: Optional[bool] = None
+
+    @property
+    def _session(self) -> "requests.Session":
+        """
+        Pooled session shared by every call, so the TLS connection to the
+        Jules API is reused across the create/poll round-trips.
+        """
+        if self._http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            session.headers.update(self.headers)
+            # 429 is left to the polling loop, which backs off within its
+            # deadline; Retry-After is not honoured here so the adapter's
+            # own sleeps stay short.
+            retries = Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[500, 502, 503, 504],
+                respect_retry_after_header=False,
+                raise_on_status=False
+            )
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retries))
+            self._http_session = session
+
+        return self._http_session
+
+    @property
+    def _watch_session(self) -> "requests.Session":
+        """
+        Session for the streaming watch request. It never retries: a
+        retried long-poll would multiply its read timeout.
+        """
+        if self._http_watch_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount("https://", HTTPAdapter(max_retries=0))
+            self._http_watch_session = session
+
+        return self._http_watch_session
+
+    def _make_request(self, method: str, endpoint: str, **kwargs) -> "requests.Response":
         """Make authenticated request to Jules API."""
         url = f"{self.base_url}/{endpoint}"
-        kwargs.setdefault('headers', {}).update(self.headers)
         kwargs.setdefault('timeout', 60)
 
-        response = requests.request(method, url, **kwargs)
+        response = self._session.request(method, url, **kwargs)
         response.raise_for_status()
         return response
 
     def list_sources(self) -> List[Dict[str, Any]]:
         """List available sources (GitHub repositories)."""
         response = self._make_request("GET", "sources")
-        data = response.json()
+        data = orjson.loads(response.content)
         return data.get("sources", [])
 
     def find_source(self) -> Optional[str]:
         """Find the source name for the current repository."""
-        sources = self.list_sources()
+        key = (self.repo_owner, self.repo_name)
+        source_name = self._source_cache.get(key)
+        if source_name:
+            return source_name
 
-        for source in sources:
-            github_repo = source.get("githubRepo", {})
-            if (github_repo.get("owner") == self.repo_owner and
-                github_repo.get("repo") == self.repo_name):
-                return source.get("name")
+        # Index every listed source so later lookups skip the API call; the
+        # first source listed for a repository wins, as in a linear scan.
+        for source in self.list_sources():
+            github_repo = source.get("githubRepo")
+            if github_repo is not None:
+                repo_key = (github_repo.get("owner"), github_repo.get("repo"))
+                self._source_cache.setdefault(repo_key, source.get("name"))
 
-        return None
+        return self._source_cache.get(key)
 
     def create_session(self, prompt: str, source_name: str, title: str = "Architecture Planning") -> Dict[str, Any]:
         """Create a new Jules session."""
@@ -62,150 +221,325 @@ class JulesPlanner:
             "requirePlanApproval": False  # Auto-approve plans for API sessions
         }
 
-        response = self._make_request("POST", "sessions", json=payload)
-        return response.json()
+        response = self._make_request(
+            "POST",
+            "sessions",
+            data=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"}
+        )
+        return orjson.loads(response.content)
 
     def get_session(self, session_id: str) -> Dict[str, Any]:
         """Get session details."""
         response = self._make_request("GET", f"sessions/{session_id}")
-        return response.json()
+        return orjson.loads(response.content)
+
+    def _list_activities_page(self, session_id: str, page_size: int, filter_expr: Optional[str] = None,
+                              page_token: Optional[str] = None) -> Dict[str, Any]:
+        """Fetch one raw page of session activities."""
+        params: Dict[str, Any] = {"pageSize": page_size}
+        if filter_expr:
+            params["filter"] = filter_expr
+        if page_token:
+            params["pageToken"] = page_token
+
+        response = self._make_request("GET", f"sessions/{session_id}/activities", params=params)
+        return orjson.loads(response.content)
+
+    def list_activities(self, session_id: str, page_size: int = 10,
+                        filter_expr: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List activities in a session, optionally filtered server-side."""
+        return self._list_activities_page(session_id, page_size, filter_expr).get("activities", [])
+
+    def iter_activities(self, session_id: str, page_size: int = 50,
+                        filter_expr: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over every activity in a session, one page at a time.
 
-    def list_activities(self, session_id: str, page_size: int = 50) -> List[Dict[str, Any]]:
-        """List activities in a session."""
-        response = self._make_request("GET", f"sessions/{session_id}/activities?pageSize={page_size}")
-        data = response.json()
-        return data.get("activities", [])
+        The next page is only requested once the caller has consumed the
+        current one, so stopping early skips the remaining requests and
+        at most one page is held in memory.
+        """
+        page_token = None
+        while True:
+            data = self._list_activities_page(session_id, page_size, filter_expr, page_token)
+            yield from data.get("activities", [])
+
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                return
+
+    def _collect_new_activities(self, activities: Iterator[Dict[str, Any]],
+                                last_seen: Optional[str]) -> List[Dict[str, Any]]:
+        """Take activities newer than last_seen, stopping at a plan or completion."""
+        last_key = _timestamp_key(last_seen) if last_seen else None
+        new_activities = []
+
+        for activity in activities:
+            # Activities without a createTime cannot be placed against
+            # the cursor, so they are kept rather than dropped.
+            if last_key and "createTime" in activity and _timestamp_key(activity["createTime"]) <= last_key:
+                continue
+            new_activities.append(activity)
+            # Nothing after a plan or completion matters to the caller
+            if _activity_kind(activity) in ("planGenerated", "sessionCompleted"):
+                break
 
-    def wait_for_plan(self, session_id: str, max_wait: int = 120) -> Optional[str]:
+        return new_activities
+
+    def _poll_activities(self, session_id: str) -> List[Dict[str, Any]]:
         """
-        Wait for Jules to generate a plan and extract it.
+        Fetch the activities added since the previous poll.
 
-        Args:
-            session_id: The session ID to monitor
-            max_wait: Maximum seconds to wait
+        The filter and createTime cursor are applied server-side when the
+        API accepts them; otherwise every activity is paged through and
+        already seen ones are dropped here. Either way paging stops once a
+        plan or completion turns up.
+        """
+        import requests
+
+        last_seen = self._last_activity_seen.get(session_id)
+        activities = None
+
+        if self._activity_filter_supported:
+            filter_expr = PLAN_ACTIVITY_FILTER
+            if last_seen:
+                filter_expr = f'({PLAN_ACTIVITY_FILTER}) AND createTime > "{last_seen}"'
+            try:
+                activities = self._collect_new_activities(
+                    self.iter_activities(session_id, page_size=10, filter_expr=filter_expr),
+                    last_seen
+                )
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code != 400:
+                    raise
+                self._activity_filter_supported = False
+
+        if activities is None:
+            activities = self._collect_new_activities(self.iter_activities(session_id), last_seen)
+
+        create_times = [a["createTime"] for a in activities if "createTime" in a]
+        if last_seen:
+            create_times.append(last_seen)
+        if create_times:
+            self._last_activity_seen[session_id] = max(create_times, key=_timestamp_key)
+
+        return activities
+
+    def _scan_activities(self, activities: List[Dict[str, Any]]) -> Tuple[Optional[str], bool]:
+        """
+        Scan a list of activities for the generated plan and for completion.
+
+        The whole list is always scanned, so a plan listed after the
+        sessionCompleted activity is still picked up.
 
         Returns:
-            The generated plan as markdown, or None if not found
+            The plan formatted as markdown (or None) and whether the
+            session has completed
         """
-        start_time = time.time()
         plan_text = None
+        completed = False
 
-        while (time.time() - start_time) < max_wait:
-            activities = self.list_activities(session_id)
+        for activity in activities:
+            kind = _activity_kind(activity)
 
-            # Look for plan generation activity
-            for activity in activities:
-                if "planGenerated" in activity:
-                    plan = activity["planGenerated"].get("plan", {})
-                    steps = plan.get("steps", [])
-
-                    if steps:
-                        # Format plan steps as markdown
-                        plan_lines = ["## 📋 Implementation Plan\n"]
-                        for step in steps:
-                            step_num = step.get("index", 0) + 1
-                            title = step.get("title", "")
-                            plan_lines.append(f"{step_num}. **{title}**")
-
-                        plan_text = "\n".join(plan_lines)
-
-                # Also collect progress updates and other insights
-                if "progressUpdated" in activity:
-                    pass
-                    # Could append progress updates to plan if needed
-
-                # Check if session completed
-                if "sessionCompleted" in activity:
-                    break
+            if kind == "planGenerated":
+                plan = activity["planGenerated"].get("plan", {})
+                steps = plan.get("steps", [])
 
-            if plan_text:
-                break
+                if steps:
+                    # Format plan steps as markdown
+                    plan_lines = ["## 📋 Implementation Plan\n"]
+                    for step in steps:
+                        step_num = step.get("index", 0) + 1
+                        title = step.get("title", "")
+                        plan_lines.append(f"{step_num}. **{title}**")
 
-            time.sleep(5)  # Poll every 5 seconds
+                    plan_text = "\n".join(plan_lines)
 
-        return plan_text
+            elif kind == "progressUpdated":
+                pass
+                # Could append progress updates to plan if needed
 
-    def _build_planning_prompt(self, context: Dict[str, Any]) -> str:
-        """Build the planning prompt from context."""
-        issue_title = context.get("title", "")
-        issue_body = context.get("body", "")
-        comment_body = context.get("comment", "")
-        issue_number = context.get("number", "")
-        is_pr = context.get("is_pr", False)
+            elif kind == "sessionCompleted":
+                completed = True
 
-        entity_type = "Pull Request" if is_pr else "Issue"
+        return plan_text, completed
 
-        prompt = f"""Create a detailed architecture and implementation plan for the following request.
+    @staticmethod
+    def _poll_interval(attempt: int) -> float:
+        """Jittered exponential backoff interval for the given poll attempt."""
+        interval = min(POLL_MAX_INTERVAL, POLL_BASE_INTERVAL * (POLL_BACKOFF_FACTOR ** attempt))
+        return interval * random.uniform(0.8, 1.2)
 
-**{entity_type} #{issue_number}: {issue_title}**
+    @staticmethod
+    def _retry_after(response: "requests.Response") -> Optional[float]:
+        """Seconds requested by a Retry-After header, if it carries one."""
+        value = response.headers.get("Retry-After")
+        try:
+            return max(0.0, float(value)) if value is not None else None
+        except ValueError:
+            return None  # HTTP-date form; fall back to our own backoff
 
-**Description:**
-{issue_body}
+    def wait_for_plans(self, session_ids: List[str], max_wait: int = 120) -> Dict[str, Optional[str]]:
+        """
+        Wait for Jules to generate plans for several sessions at once.
 
-**Planning Request:**
-{comment_body}
+        Every pending session is polled on each tick over the shared
+        connection, so waiting on N sessions costs one wait rather than N.
+        The poll interval backs off while nothing changes and resets as
+        soon as a new activity shows up.
 
-Please provide a comprehensive architecture and design plan that includes:
+        Args:
+            session_ids: The session IDs to monitor
+            max_wait: Maximum seconds to wait
 
-1. **Architecture Overview**
-   - High-level system design
-   - Key components and their interactions
-   - Data flow diagrams (in text/markdown format)
+        Returns:
+            Mapping of session ID to its plan as markdown, or None if not found
+        """
+        import requests
+
+        deadline = time.time() + max_wait
+        plans: Dict[str, Optional[str]] = {session_id: None for session_id in session_ids}
+        pending = list(session_ids)
+        attempt = 0
+
+        while pending and time.time() < deadline:
+            progressed = False
+            throttled_for = None
+
+            for session_id in list(pending):
+                cursor = self._last_activity_seen.get(session_id)
+                try:
+                    activities = self._poll_activities(session_id)
+                except requests.exceptions.HTTPError as e:
+                    if e.response is None or e.response.status_code != 429:
+                        raise
+                    throttled_for = self._retry_after(e.response)
+                    if throttled_for is None:
+                        throttled_for = 2 * self._poll_interval(attempt)
+                    break
 
-2. **Technology Stack Recommendations**
-   - Recommended technologies and frameworks
-   - Justification for each choice
-   - Alternatives considered
+                # The createTime cursor only moves when a new activity arrives
+                if self._last_activity_seen.get(session_id) != cursor:
+                    progressed = True
 
-3. **Implementation Strategy**
-   - Phased implementation approach
-   - Key milestones and deliverables
-   - Dependencies and prerequisites
+                # A completed session will not produce a plan later, so
+                # stop polling it as soon as either is seen.
+                plan_text, completed = self._scan_activities(activities)
+                if plan_text or completed:
+                    plans[session_id] = plan_text
+                    pending.remove(session_id)
 
-4. **Design Decisions**
-   - Critical architectural decisions
-   - Trade-offs and rationale
-   - Scalability considerations
+            if not pending:
+                break
 
-5. **Security & Performance**
-   - Security considerations
-   - Performance optimization strategies
-   - Monitoring and observability approach
+            attempt = 0 if progressed else attempt + 1
+            interval = throttled_for if throttled_for is not None else self._poll_interval(attempt)
+            time.sleep(min(interval, max(0.0, deadline - time.time())))
 
-6. **Risk Analysis**
-   - Potential risks and challenges
-   - Mitigation strategies
-   - Fallback options
+        return plans
 
-7. **Next Steps**
-   - Immediate action items
-   - Long-term roadmap
-   - Success criteria
+    def _watch_for_plan(self, session_id: str, max_wait: float) -> Tuple[Optional[str], bool]:
+        """
+        Follow the streaming activities endpoint until a plan arrives.
 
-Format your response in clear, well-structured Markdown. Use diagrams (ASCII/text-based), tables, and code examples where appropriate.
+        The stream is newline-delimited JSON, one activity per line, served
+        over a single long-lived request. The endpoint is not part of the
+        published API, so any failure to open it other than a 401 is
+        treated as "unsupported", remembered, and polling is used instead.
 
-Focus on practical, actionable recommendations that can guide the development team.
-"""
+        Returns:
+            The plan (or None) and whether watching settled the session,
+            i.e. no polling is needed afterwards
+        """
+        import requests
 
-        return prompt
+        deadline = time.time() + max_wait
+        if max_wait <= 0:
+            return None, False
 
-    def generate_plan(self, context: Dict[str, Any]) -> str:
+        url = f"{self.base_url}/sessions/{session_id}/activities:watch"
+        try:
+            remaining = max(0.001, deadline - time.time())
+            response = self._watch_session.get(url, stream=True, timeout=(min(10, remaining), remaining))
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError:
+                response.close()
+                raise
+        except requests.exceptions.RequestException as e:
+            if isinstance(e, requests.exceptions.HTTPError) and e.response is not None \
+                    and e.response.status_code == 401:
+                raise
+            self._watch_supported = False
+            return None, False
+
+        self._watch_supported = True
+        with response:
+            try:
+                for line in response.iter_lines():
+                    if line:
+                        try:
+                            activity = orjson.loads(line)
+                        except ValueError:
+                            activity = None
+                        if not isinstance(activity, dict):
+                            # Not one activity object per line (e.g. a JSON
+                            # array body); treat the endpoint as unsupported.
+                            self._watch_supported = False
+                            return None, False
+
+                        plan_text, completed = self._scan_activities([activity])
+                        if plan_text or completed:
+                            return plan_text, True
+                    if time.time() >= deadline:
+                        break
+            except requests.exceptions.RequestException:
+                pass  # Stream dropped; the caller polls for the remaining time
+
+        return None, False
+
+    def wait_for_plan(self, session_id: str, max_wait: int = 120) -> Optional[str]:
         """
-        Generate architecture/design plan based on context.
+        Wait for Jules to generate a plan and extract it.
+
+        Uses the streaming activities endpoint when available and falls
+        back to polling for whatever time is left.
 
         Args:
-            context: Dictionary containing issue/PR details
+            session_id: The session ID to monitor
+            max_wait: Maximum seconds to wait
 
         Returns:
-            Generated plan as markdown string
+            The generated plan as markdown, or None if not found
         """
-        try:
-            # Find the source for this repository
-            print("🔍 Looking for repository in Jules sources...")
-            source_name = self.find_source()
+        deadline = time.time() + max_wait
 
-            if not source_name:
-                return f"""❌ **Repository Not Found**
+        if self._watch_supported is not False:
+            plan_text, settled = self._watch_for_plan(session_id, max_wait)
+            if settled:
+                return plan_text
+
+        remaining = max(0.0, deadline - time.time())
+        return self.wait_for_plans([session_id], remaining)[session_id]
+
+    def _build_planning_prompt(self, context: Dict[str, Any]) -> str:
+        """Build the planning prompt from context."""
+        entity_type = "Pull Request" if context.get("is_pr", False) else "Issue"
+
+        header = _PROMPT_HEADER_TMPL.format_map({
+            "entity_type": entity_type,
+            "number": context.get("number", ""),
+            "title": context.get("title", ""),
+            "body": context.get("body", ""),
+            "comment": context.get("comment", ""),
+        })
+        return f"{header}\n{_PROMPT_TAIL}"
+
+    def _repo_not_found_message(self) -> str:
+        """Explain how to connect this repository to Jules."""
+        return f"""❌ **Repository Not Found**
 
 The repository `{self.repo_owner}/{self.repo_name}` is not connected to Jules.
 
@@ -216,44 +550,36 @@ The repository `{self.repo_owner}/{self.repo_name}` is not connected to Jules.
 
 For more information, see the [Jules documentation](https://jules.google/docs)."""
 
-            print(f"✓ Found source: {source_name}")
-
-            # Build the planning prompt
-            prompt = self._build_planning_prompt(context)
-
-            # Create a session
-            print("📝 Creating Jules planning session...")
-            session_title = f"Architecture Plan: {context.get('title', 'Issue')}"
-            session = self.create_session(prompt, source_name, session_title)
-            session_id = session.get("id")
-
-            print(f"✓ Session created: {session_id}")
-
-            # Wait for the plan to be generated
-            print("⏳ Waiting for Jules to generate the plan...")
-            plan = self.wait_for_plan(session_id, max_wait=120)
-
-            if not plan:
-                # Fallback: get all activities and format them
-                print("⚠ No plan found, retrieving session activities...")
-                activities = self.list_activities(session_id)
+    def _create_planning_session(self, context: Dict[str, Any], source_name: str) -> str:
+        """Create a planning session for the context and return its ID."""
+        prompt = self._build_planning_prompt(context)
+        session_title = f"Architecture Plan: {context.get('title', 'Issue')}"
+        session = self.create_session(prompt, source_name, session_title)
+        return session.get("id")
+
+    def _finish_plan(self, session_id: str, plan: Optional[str]) -> str:
+        """Return the plan, or a session summary / status note when there is none."""
+        if not plan:
+            # Fallback: get all activities and format them
+            log.warning("⚠ No plan found, retrieving session activities...")
+            activities = self.list_activities(session_id)
 
-                if activities:
-                    plan_parts = ["## 📊 Jules Session Summary\n"]
-                    for activity in activities[:10]:  # Limit to first 10 activities
-                        if "progressUpdated" in activity:
-                            progress = activity["progressUpdated"]
-                            title = progress.get("title", "")
-                            description = progress.get("description", "")
-                            if title:
-                                plan_parts.append(f"- **{title}**")
-                                if description:
-                                    plan_parts.append(f"  {description}\n")
+            if activities:
+                plan_parts = ["## 📊 Jules Session Summary\n"]
+                for activity in activities[:10]:  # Limit to first 10 activities
+                    if "progressUpdated" in activity:
+                        progress = activity["progressUpdated"]
+                        title = progress.get("title", "")
+                        description = progress.get("description", "")
+                        if title:
+                            plan_parts.append(f"- **{title}**")
+                            if description:
+                                plan_parts.append(f"  {description}\n")
 
-                    plan = "\n".join(plan_parts) if len(plan_parts) > 1 else None
+                plan = "\n".join(plan_parts) if len(plan_parts) > 1 else None
 
-            if not plan:
-                return f"""⚠️ **Planning Session Created**
+        if not plan:
+            return f"""⚠️ **Planning Session Created**
 
 Jules session has been initiated but no plan was generated yet.
 
@@ -261,10 +587,14 @@ View the session progress at: https://jules.google.com
 
 Session ID: `{session_id}`"""
 
-            return plan
+        return plan
+
+    def _error_message(self, error: Exception) -> str:
+        """Turn an exception raised while planning into a user-facing message."""
+        import requests
 
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
+        if isinstance(error, requests.exceptions.HTTPError):
+            if error.response.status_code == 401:
                 return """❌ **Authentication Error**
 
 The `JULES_API_KEY` is invalid or has expired.
@@ -276,9 +606,103 @@ The `JULES_API_KEY` is invalid or has expired.
 
 For more information, see the [Jules API documentation](https://developers.google.com/jules/api)."""
             else:
-                return f"❌ Error calling Jules API: {e.response.status_code} {e.response.reason}"
+                return f"❌ Error calling Jules API: {error.response.status_code} {error.response.reason}"
+
+        if isinstance(error, requests.exceptions.RequestException):
+            return f"❌ Error calling Jules API: {str(error)}"
+        return f"❌ Unexpected error: {str(error)}"
+
+    def generate_plan(self, context: Dict[str, Any]) -> str:
+        """
+        Generate architecture/design plan based on context.
+
+        Args:
+            context: Dictionary containing issue/PR details
+
+        Returns:
+            Generated plan as markdown string
+        """
+        try:
+            # Find the source for this repository
+            log.info("🔍 Looking for repository in Jules sources...")
+            source_name = self.find_source()
+
+            if not source_name:
+                return self._repo_not_found_message()
+
+            log.info(f"✓ Found source: {source_name}")
+
+            # Create a session
+            log.info("📝 Creating Jules planning session...")
+            session_id = self._create_planning_session(context, source_name)
+
+            log.info(f"✓ Session created: {session_id}")
+
+            # Wait for the plan to be generated
+            log.info("⏳ Waiting for Jules to generate the plan...")
+            plan = self.wait_for_plan(session_id, max_wait=120)
+
+            return self._finish_plan(session_id, plan)
 
-        except requests.exceptions.RequestException as e:
-            return f"❌ Error calling Jules API: {str(e)}"
         except Exception as e:
-            return f"❌ Unexpected error: {str(e)}"
+            return self._error_message(e)
+
+    def generate_plans(self, contexts: List[Dict[str, Any]], max_wait: int = 120) -> List[str]:
+        """
+        Generate plans for several issues/PRs in one run.
+
+        The source is looked up once, the sessions are created in parallel
+        and all of them are polled together.
+
+        Args:
+            contexts: Dictionaries containing issue/PR details
+            max_wait: Maximum seconds to wait for all plans
+
+        Returns:
+            Generated plans as markdown strings, in the order of contexts
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not contexts:
+            return []
+
+        try:
+            log.info("🔍 Looking for repository in Jules sources...")
+            source_name = self.find_source()
+        except Exception as e:
+            return [self._error_message(e)] * len(contexts)
+
+        if not source_name:
+            return [self._repo_not_found_message()] * len(contexts)
+
+        log.info(f"✓ Found source: {source_name}")
+
+        # Errors are kept per context so one failure does not discard the
+        # other issues' sessions or plans.
+        results: List[Optional[str]] = [None] * len(contexts)
+        session_ids: Dict[int, str] = {}
+
+        log.info(f"📝 Creating {len(contexts)} Jules planning sessions...")
+        with ThreadPoolExecutor(max_workers=min(len(contexts), MAX_PARALLEL_SESSIONS)) as pool:
+            futures = [pool.submit(self._create_planning_session, context, source_name) for context in contexts]
+            for index, future in enumerate(futures):
+                try:
+                    session_ids[index] = future.result()
+                except Exception as e:
+                    results[index] = self._error_message(e)
+
+        if session_ids:
+            log.info("⏳ Waiting for Jules to generate the plans...")
+            try:
+                plans = self.wait_for_plans(list(session_ids.values()), max_wait=max_wait)
+            except Exception as e:
+                for index in session_ids:
+                    results[index] = self._error_message(e)
+            else:
+                for index, session_id in session_ids.items():
+                    try:
+                        results[index] = self._finish_plan(session_id, plans[session_id])
+                    except Exception as e:
+                        results[index] = self._error_message(e)
+
+        return results
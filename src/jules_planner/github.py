@@ -1,8 +1,34 @@
 import os
-import json
 import sys
-import requests
-from typing import Dict, Any
+import functools
+import logging
+import orjson
+from typing import TYPE_CHECKING, Dict, Any, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+log = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def _gh_session() -> "requests.Session":
+    """Shared session so every GitHub API call reuses one pooled connection."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+    session.headers.update({"Accept": "application/vnd.github.v3+json"})
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def _load_event(event_path: str) -> Dict[str, Any]:
+    """Read and parse the GitHub event payload, once per path."""
+    with open(event_path, 'rb') as f:
+        return orjson.loads(f.read())
+
 
 def get_issue_context() -> Dict[str, Any]:
     """Extract issue/PR context from GitHub environment variables."""
@@ -12,8 +38,7 @@ def get_issue_context() -> Dict[str, Any]:
     if not event_path or not os.path.exists(event_path):
         raise ValueError("GitHub event data not found")
 
-    with open(event_path, 'r') as f:
-        event_data = json.load(f)
+    event_data = _load_event(event_path)
 
     # Extract relevant information
     issue = event_data.get("issue", {})
@@ -29,33 +54,35 @@ def get_issue_context() -> Dict[str, Any]:
     }
 
 
-def post_comment_to_github(comment_body: str) -> None:
-    """Post the generated plan as a comment on the issue/PR."""
+def post_comment_to_github(comment_body: str, issue_number: Optional[int] = None) -> None:
+    """
+    Post the generated plan as a comment on the issue/PR.
+
+    Callers that already hold the issue context can pass its number so
+    the event payload is not consulted again.
+    """
     github_token = os.getenv("GITHUB_TOKEN")
     repo = os.getenv("GITHUB_REPOSITORY")
     event_path = os.getenv("GITHUB_EVENT_PATH")
 
-    if not all([github_token, repo, event_path]):
-        print("Error: Missing required GitHub environment variables")
+    if not all([github_token, repo, issue_number or event_path]):
+        log.error("Error: Missing required GitHub environment variables")
         sys.exit(1)
 
-    with open(event_path, 'r') as f:
-        event_data = json.load(f)
-
-    issue_number = event_data.get("issue", {}).get("number")
+    if not issue_number:
+        issue_number = _load_event(event_path).get("issue", {}).get("number")
 
     if not issue_number:
-        print("Error: Could not determine issue number")
+        log.error("Error: Could not determine issue number")
         sys.exit(1)
 
     # Post comment using GitHub API
     url = f"https://api.github.com/repos/{repo}/issues/{issue_number}/comments"
     headers = {
-        "Authorization": f"Bearer {github_token}",
-        "Accept": "application/vnd.github.v3+json"
+        "Authorization": f"Bearer {github_token}"
     }
 
-    response = requests.post(
+    response = _gh_session().post(
         url,
         headers=headers,
         json={"body": comment_body},
@@ -63,7 +90,7 @@ def post_comment_to_github(comment_body: str) -> None:
     )
 
     if response.status_code == 201:
-        print("✅ Successfully posted Jules plan to GitHub")
+        log.info("✅ Successfully posted Jules plan to GitHub")
     else:
-        print(f"❌ Failed to post comment: {response.status_code} - {response.text}")
+        log.error(f"❌ Failed to post comment: {response.status_code} - {response.text}")
         sys.exit(1)
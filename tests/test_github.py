@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import orjson
+from jules_planner import github
+from jules_planner.github import get_issue_context, post_comment_to_github
+
+class TestGitHub(unittest.TestCase):
+    def setUp(self):
+        github._load_event.cache_clear()
+        self.addCleanup(github._load_event.cache_clear)
+
+        event = {
+            "issue": {"number": 7, "title": "Test Issue", "body": "Body"},
+            "comment": {"body": "@jules plan", "user": {"login": "octocat"}}
+        }
+        fd, self.event_path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(event))
+        self.addCleanup(os.remove, self.event_path)
+
+        self.env = {
+            "GITHUB_TOKEN": "test_token",
+            "GITHUB_REPOSITORY": "test_owner/test_repo",
+            "GITHUB_EVENT_PATH": self.event_path
+        }
+
+    @patch("jules_planner.github._load_event")
+    @patch("jules_planner.github._gh_session")
+    def test_post_comment_with_issue_number(self, mock_gh_session, mock_load_event):
+        mock_gh_session.return_value.post.return_value = MagicMock(status_code=201)
+        env = {k: v for k, v in self.env.items() if k != "GITHUB_EVENT_PATH"}
+
+        with patch.dict(os.environ, env, clear=True):
+            post_comment_to_github("plan", 5)
+
+        mock_load_event.assert_not_called()
+        mock_gh_session.return_value.post.assert_called_once_with(
+            "https://api.github.com/repos/test_owner/test_repo/issues/5/comments",
+            headers={"Authorization": "Bearer test_token"},
+            json={"body": "plan"},
+            timeout=30
+        )
+
+    @patch("jules_planner.github._gh_session")
+    def test_event_parsed_once(self, mock_gh_session):
+        mock_gh_session.return_value.post.return_value = MagicMock(status_code=201)
+
+        with patch.dict(os.environ, self.env, clear=True), \
+                patch("jules_planner.github.orjson.loads", wraps=orjson.loads) as mock_loads:
+            context = get_issue_context()
+            post_comment_to_github("plan")
+
+        self.assertEqual(context["number"], 7)
+        self.assertEqual(context["author"], "octocat")
+        mock_loads.assert_called_once()
+        args, _ = mock_gh_session.return_value.post.call_args
+        self.assertEqual(args, ("https://api.github.com/repos/test_owner/test_repo/issues/7/comments",))
+
+if __name__ == '__main__':
+    unittest.main()
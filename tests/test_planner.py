@@ -1,6 +1,9 @@
+import subprocess
+import sys
 import unittest
 from unittest.mock import MagicMock, patch
-from jules_planner.client import JulesPlanner
+import requests
+from jules_planner.client import JulesPlanner, PLAN_ACTIVITY_FILTER, POLL_MAX_INTERVAL
 
 class TestJulesPlanner(unittest.TestCase):
     def setUp(self):
@@ -19,10 +22,10 @@ class TestJulesPlanner(unittest.TestCase):
         with self.assertRaises(ValueError):
             JulesPlanner("", "owner", "repo")
 
-    @patch("requests.request")
+    @patch("requests.Session.request")
     def test_list_sources(self, mock_request):
         mock_response = MagicMock()
-        mock_response.json.return_value = {"sources": [{"name": "source1"}]}
+        mock_response.content = b'{"sources": [{"name": "source1"}]}'
         mock_request.return_value = mock_response
 
         sources = self.planner.list_sources()
@@ -31,10 +34,115 @@ class TestJulesPlanner(unittest.TestCase):
         mock_request.assert_called_with(
             "GET",
             "https://jules.googleapis.com/v1alpha/sources",
-            headers={'X-Goog-Api-Key': 'test_key', 'Content-Type': 'application/json'},
             timeout=60
         )
 
+    def test_import_does_not_load_requests(self):
+        code = "import sys, jules_planner.cli; sys.exit('requests' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code])
+        self.assertEqual(result.returncode, 0)
+
+    def test_session_leaves_429_to_poll_loop(self):
+        retries = self.planner._session.get_adapter("https://jules.googleapis.com").max_retries
+        self.assertNotIn(429, retries.status_forcelist)
+        self.assertFalse(retries.respect_retry_after_header)
+
+    def test_session_headers(self):
+        self.assertEqual(self.planner._session.headers["X-Goog-Api-Key"], self.api_key)
+        self.assertNotIn("Content-Type", self.planner._session.headers)
+
+    @patch("requests.Session.request")
+    def test_create_session(self, mock_request):
+        mock_response = MagicMock()
+        mock_response.content = b'{"id": "s1"}'
+        mock_request.return_value = mock_response
+
+        session = self.planner.create_session("prompt", "sources/github/o/r")
+        self.assertEqual(session["id"], "s1")
+        args, kwargs = mock_request.call_args
+        self.assertEqual(args, ("POST", "https://jules.googleapis.com/v1alpha/sessions"))
+        self.assertEqual(kwargs["headers"], {"Content-Type": "application/json"})
+        self.assertIn(b'"source":"sources/github/o/r"', kwargs["data"])
+
+    @patch("requests.Session.request")
+    def test_list_activities_filter(self, mock_request):
+        mock_response = MagicMock()
+        mock_response.content = b'{"activities": [{"planGenerated": {}}]}'
+        mock_request.return_value = mock_response
+
+        activities = self.planner.list_activities("s1", page_size=5, filter_expr=PLAN_ACTIVITY_FILTER)
+        self.assertEqual(len(activities), 1)
+        mock_request.assert_called_with(
+            "GET",
+            "https://jules.googleapis.com/v1alpha/sessions/s1/activities",
+            params={"pageSize": 5, "filter": PLAN_ACTIVITY_FILTER},
+            timeout=60
+        )
+
+    @patch("jules_planner.client.JulesPlanner._list_activities_page")
+    def test_poll_activities_drops_rejected_filter(self, mock_page):
+        mock_page.side_effect = [
+            requests.exceptions.HTTPError(response=MagicMock(status_code=400)),
+            {"activities": []},
+            {"activities": []},
+        ]
+
+        self.planner._poll_activities("s1")
+        self.planner._poll_activities("s1")
+        self.assertFalse(self.planner._activity_filter_supported)
+        mock_page.assert_called_with("s1", 50, None, None)
+        self.assertEqual(mock_page.call_count, 3)
+
+    @patch("jules_planner.client.JulesPlanner._list_activities_page")
+    def test_iter_activities_follows_page_tokens(self, mock_page):
+        mock_page.side_effect = [
+            {"activities": [{"progressUpdated": {}}], "nextPageToken": "t1"},
+            {"activities": [{"planGenerated": {}}], "nextPageToken": "t2"},
+            {"activities": [{"sessionCompleted": {}}]},
+        ]
+
+        activities = self.planner.iter_activities("s1")
+        self.assertIn("progressUpdated", next(activities))
+        self.assertIn("planGenerated", next(activities))
+        # Pages are fetched lazily, so the third one has not been requested
+        self.assertEqual(mock_page.call_count, 2)
+        mock_page.assert_called_with("s1", 50, None, "t1")
+
+    @patch("jules_planner.client.JulesPlanner._list_activities_page")
+    def test_poll_activities_only_returns_new(self, mock_page):
+        first = {"createTime": "2025-01-01T00:00:01Z", "progressUpdated": {}}
+        second = {"createTime": "2025-01-01T00:00:02Z", "progressUpdated": {}}
+        mock_page.side_effect = [{"activities": [first]}, {"activities": [second]}]
+
+        self.assertEqual(self.planner._poll_activities("s1"), [first])
+        self.assertEqual(self.planner._poll_activities("s1"), [second])
+        mock_page.assert_called_with(
+            "s1", 10, f'({PLAN_ACTIVITY_FILTER}) AND createTime > "2025-01-01T00:00:01Z"', None
+        )
+        self.assertEqual(self.planner._last_activity_seen["s1"], "2025-01-01T00:00:02Z")
+
+    @patch("jules_planner.client.JulesPlanner.iter_activities")
+    def test_poll_activities_skips_seen_without_filter(self, mock_iter_activities):
+        self.planner._activity_filter_supported = False
+        first = {"createTime": "2025-01-01T00:00:01Z", "progressUpdated": {}}
+        second = {"createTime": "2025-01-01T00:00:02Z", "progressUpdated": {}}
+        mock_iter_activities.side_effect = [iter([first]), iter([first, second])]
+
+        self.assertEqual(self.planner._poll_activities("s1"), [first])
+        self.assertEqual(self.planner._poll_activities("s1"), [second])
+
+    @patch("jules_planner.client.JulesPlanner.iter_activities")
+    def test_poll_activities_compares_fractional_timestamps(self, mock_iter_activities):
+        self.planner._activity_filter_supported = False
+        self.planner._last_activity_seen["s1"] = "2025-01-01T00:00:01Z"
+        seen = {"createTime": "2025-01-01T00:00:00.999Z", "progressUpdated": {}}
+        undated = {"progressUpdated": {}}
+        plan = {"createTime": "2025-01-01T00:00:01.250Z", "planGenerated": {}}
+        mock_iter_activities.return_value = iter([seen, undated, plan])
+
+        self.assertEqual(self.planner._poll_activities("s1"), [undated, plan])
+        self.assertEqual(self.planner._last_activity_seen["s1"], "2025-01-01T00:00:01.250Z")
+
     @patch("jules_planner.client.JulesPlanner.list_sources")
     def test_find_source(self, mock_list_sources):
         mock_list_sources.return_value = [
@@ -57,12 +165,203 @@ class TestJulesPlanner(unittest.TestCase):
         source_name = self.planner.find_source()
         self.assertEqual(source_name, "target_source")
 
+        # Second lookup is served from the cache
+        self.assertEqual(self.planner.find_source(), "target_source")
+        mock_list_sources.assert_called_once()
+
+    @patch("jules_planner.client.JulesPlanner.list_sources")
+    def test_find_source_prefers_first_match(self, mock_list_sources):
+        github_repo = {"owner": self.repo_owner, "repo": self.repo_name}
+        mock_list_sources.return_value = [
+            {"name": "no_repo_source"},
+            {"name": "first_source", "githubRepo": github_repo},
+            {"name": "second_source", "githubRepo": github_repo},
+        ]
+
+        self.assertEqual(self.planner.find_source(), "first_source")
+
     @patch("jules_planner.client.JulesPlanner.list_sources")
     def test_find_source_not_found(self, mock_list_sources):
         mock_list_sources.return_value = []
         source_name = self.planner.find_source()
         self.assertIsNone(source_name)
 
+    @patch("time.sleep")
+    @patch("jules_planner.client.JulesPlanner.iter_activities")
+    def test_wait_for_plans(self, mock_iter_activities, mock_sleep):
+        plan_activity = {"planGenerated": {"plan": {"steps": [{"index": 0, "title": "Step one"}]}}}
+        responses = {
+            "s1": [[plan_activity]],
+            "s2": [[{"progressUpdated": {"title": "Working"}}], [plan_activity]],
+        }
+        mock_iter_activities.side_effect = lambda session_id, **kwargs: iter(responses[session_id].pop(0))
+
+        plans = self.planner.wait_for_plans(["s1", "s2"], max_wait=60)
+        self.assertIn("1. **Step one**", plans["s1"])
+        self.assertIn("1. **Step one**", plans["s2"])
+        self.assertEqual(mock_iter_activities.call_count, 3)
+        mock_sleep.assert_called_once()
+
+    @patch("time.sleep")
+    @patch("jules_planner.client.JulesPlanner._poll_interval", return_value=1.0)
+    @patch("jules_planner.client.JulesPlanner.iter_activities")
+    def test_wait_for_plans_resets_backoff_on_progress(self, mock_iter_activities, mock_poll_interval, mock_sleep):
+        plan_activity = {"planGenerated": {"plan": {"steps": [{"index": 0, "title": "Step one"}]}}}
+        progress = {"createTime": "2025-01-01T00:00:01Z", "progressUpdated": {"title": "Working"}}
+        mock_iter_activities.side_effect = [iter([]), iter([]), iter([progress]), iter([plan_activity])]
+
+        self.planner.wait_for_plans(["s1"], max_wait=60)
+        attempts = [call.args[0] for call in mock_poll_interval.call_args_list]
+        self.assertEqual(attempts, [1, 2, 0])
+
+    @patch("time.sleep")
+    @patch("jules_planner.client.JulesPlanner.iter_activities")
+    def test_wait_for_plan_stops_on_session_completed(self, mock_iter_activities, mock_sleep):
+        self.planner._watch_supported = False
+        mock_iter_activities.return_value = iter([{"sessionCompleted": {}}])
+
+        self.assertIsNone(self.planner.wait_for_plan("s1", max_wait=60))
+        mock_iter_activities.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_scan_activities_plan_after_completion(self):
+        activities = [
+            {"sessionCompleted": {}},
+            {"planGenerated": {"plan": {"steps": [{"index": 0, "title": "Step one"}]}}},
+        ]
+        plan_text, completed = self.planner._scan_activities(activities)
+        self.assertIn("1. **Step one**", plan_text)
+        self.assertTrue(completed)
+
+    def test_wait_for_plan_streams_activities(self):
+        mock_response = MagicMock()
+        mock_response.iter_lines.return_value = [
+            b'{"progressUpdated": {"title": "Reading code"}}',
+            b'',
+            b'{"planGenerated": {"plan": {"steps": [{"index": 0, "title": "Step one"}]}}}',
+        ]
+        mock_response.__enter__.return_value = mock_response
+        self.planner._http_watch_session = MagicMock()
+        self.planner._http_watch_session.get.return_value = mock_response
+
+        plan = self.planner.wait_for_plan("s1", max_wait=60)
+        self.assertIn("1. **Step one**", plan)
+        self.assertTrue(self.planner._watch_supported)
+        args, kwargs = self.planner._http_watch_session.get.call_args
+        self.assertEqual(args, ("https://jules.googleapis.com/v1alpha/sessions/s1/activities:watch",))
+        connect_timeout, read_timeout = kwargs["timeout"]
+        self.assertEqual(connect_timeout, 10)
+        self.assertLessEqual(read_timeout, 60)
+
+    def test_watch_session_does_not_retry(self):
+        retries = self.planner._watch_session.get_adapter("https://jules.googleapis.com").max_retries
+        self.assertEqual(retries.total, 0)
+
+    @patch("jules_planner.client.JulesPlanner.wait_for_plans")
+    def test_wait_for_plan_falls_back_to_polling(self, mock_wait_for_plans):
+        mock_wait_for_plans.return_value = {"s1": "plan"}
+        failures = [
+            requests.exceptions.HTTPError(response=MagicMock(status_code=404)),
+            requests.exceptions.HTTPError(response=MagicMock(status_code=403)),
+            requests.exceptions.ReadTimeout(),
+            requests.exceptions.ConnectionError(),
+        ]
+
+        for failure in failures:
+            planner = JulesPlanner(self.api_key, self.repo_owner, self.repo_name)
+            planner._http_watch_session = MagicMock()
+            planner._http_watch_session.get.side_effect = failure
+
+            self.assertEqual(planner.wait_for_plan("s1", max_wait=60), "plan")
+            self.assertFalse(planner._watch_supported)
+
+            planner.wait_for_plan("s1", max_wait=60)
+            planner._http_watch_session.get.assert_called_once()
+
+    @patch("jules_planner.client.JulesPlanner.wait_for_plans")
+    def test_wait_for_plan_falls_back_on_non_ndjson_stream(self, mock_wait_for_plans):
+        mock_wait_for_plans.return_value = {"s1": "plan"}
+
+        for body in ([b'[{', b'  "name": "sessions/s1/activities/a1"', b'}]'], [b'[1, 2]'], [b'"text"']):
+            planner = JulesPlanner(self.api_key, self.repo_owner, self.repo_name)
+            mock_response = MagicMock()
+            mock_response.iter_lines.return_value = body
+            mock_response.__enter__.return_value = mock_response
+            planner._http_watch_session = MagicMock()
+            planner._http_watch_session.get.return_value = mock_response
+
+            self.assertEqual(planner.wait_for_plan("s1", max_wait=60), "plan")
+            self.assertFalse(planner._watch_supported)
+
+    def test_wait_for_plan_watch_auth_error_raises(self):
+        self.planner._http_watch_session = MagicMock()
+        self.planner._http_watch_session.get.side_effect = requests.exceptions.HTTPError(
+            response=MagicMock(status_code=401)
+        )
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.planner.wait_for_plan("s1", max_wait=60)
+
+    @patch("time.sleep")
+    @patch("jules_planner.client.JulesPlanner._poll_activities")
+    def test_wait_for_plan_honours_retry_after(self, mock_poll_activities, mock_sleep):
+        self.planner._watch_supported = False
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "7"})
+        plan_activity = {"planGenerated": {"plan": {"steps": [{"index": 0, "title": "Step one"}]}}}
+        mock_poll_activities.side_effect = [
+            requests.exceptions.HTTPError(response=throttled),
+            [plan_activity],
+        ]
+
+        plan = self.planner.wait_for_plan("s1", max_wait=60)
+        self.assertIn("1. **Step one**", plan)
+        mock_sleep.assert_called_once_with(7.0)
+
+    def test_poll_interval_is_capped(self):
+        for attempt in (0, 3, 50):
+            interval = JulesPlanner._poll_interval(attempt)
+            self.assertGreater(interval, 0)
+            self.assertLessEqual(interval, POLL_MAX_INTERVAL * 1.2)
+
+    @patch("jules_planner.client.JulesPlanner.wait_for_plans")
+    @patch("jules_planner.client.JulesPlanner.create_session")
+    @patch("jules_planner.client.JulesPlanner.find_source")
+    def test_generate_plans(self, mock_find_source, mock_create_session, mock_wait_for_plans):
+        mock_find_source.return_value = "sources/github/test_owner/test_repo"
+        mock_create_session.side_effect = lambda prompt, source, title: {"id": title.split(": ")[1]}
+        mock_wait_for_plans.return_value = {"first": "plan one", "second": "plan two"}
+
+        plans = self.planner.generate_plans([{"title": "first"}, {"title": "second"}])
+        self.assertEqual(plans, ["plan one", "plan two"])
+        mock_find_source.assert_called_once()
+        mock_wait_for_plans.assert_called_once_with(["first", "second"], max_wait=120)
+
+    @patch("jules_planner.client.JulesPlanner.wait_for_plans")
+    @patch("jules_planner.client.JulesPlanner.create_session")
+    @patch("jules_planner.client.JulesPlanner.find_source")
+    def test_generate_plans_isolates_failures(self, mock_find_source, mock_create_session, mock_wait_for_plans):
+        mock_find_source.return_value = "sources/github/test_owner/test_repo"
+
+        def create_session(prompt, source, title):
+            if title.endswith("broken"):
+                raise requests.exceptions.HTTPError(response=MagicMock(status_code=500, reason="Server Error"))
+            return {"id": "good"}
+
+        mock_create_session.side_effect = create_session
+        mock_wait_for_plans.return_value = {"good": "plan one"}
+
+        plans = self.planner.generate_plans([{"title": "broken"}, {"title": "good"}])
+        self.assertEqual(plans[0], "❌ Error calling Jules API: 500 Server Error")
+        self.assertEqual(plans[1], "plan one")
+        mock_wait_for_plans.assert_called_once_with(["good"], max_wait=120)
+
+    @patch("jules_planner.client.JulesPlanner.find_source")
+    def test_generate_plans_repo_not_found(self, mock_find_source):
+        mock_find_source.return_value = None
+        plans = self.planner.generate_plans([{"title": "first"}, {"title": "second"}])
+        self.assertEqual(len(plans), 2)
+        self.assertTrue(all("Repository Not Found" in plan for plan in plans))
+
     def test_build_planning_prompt(self):
         context = {
             "title": "Test Issue",
@@ -76,5 +375,11 @@ class TestJulesPlanner(unittest.TestCase):
         self.assertIn("This is a test issue", prompt)
         self.assertIn("Issue #1", prompt)
 
+    def test_build_planning_prompt_keeps_braces(self):
+        context = {"title": "Format {name}", "body": "Use {0} and {}", "number": 2, "is_pr": True}
+        prompt = self.planner._build_planning_prompt(context)
+        self.assertIn("**Pull Request #2: Format {name}**", prompt)
+        self.assertIn("Use {0} and {}", prompt)
+
 if __name__ == '__main__':
     unittest.main()